@@ -1,55 +1,230 @@
 from utils.fetch_url import get_text_from_url
-from flask import Flask, request, jsonify, render_template, g, session, redirect, url_for
+from flask import Flask, Response, request, jsonify, render_template, g, session, redirect, url_for, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import BadRequest
 import os
 import math
 import json
-from typing import Dict, Any, List
+import re
+import functools
+import importlib.util
+import itertools
+import hashlib
+import pickle
+import threading
+import random
+import gzip
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 load_dotenv()   # loads variables from .env into os.environ
 
+# Models run concurrently in a thread pool; keep BLAS/OpenMP single-threaded per call
+# so the pool threads don't oversubscribe the CPU. Must be set before numpy is imported.
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
 
 
 # Try to import optional heavy deps lazily; if missing, we'll gracefully fall back
-try:  # joblib for sklearn/xgb pipelines
-    import joblib  # type: ignore
+try:  # orjson: C JSON encoder used for all Flask JSON responses when available
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional
+    orjson = None  # type: ignore
+
+try:  # brotli: smaller precompressed translation payloads than gzip for clients that accept br
+    import brotli  # type: ignore
 except Exception:  # pragma: no cover - optional
-    joblib = None  # type: ignore
+    brotli = None  # type: ignore
+
+try:  # service_streamer batches concurrent Keras requests into one model.predict call
+    from service_streamer import ThreadedStreamer  # type: ignore
+except Exception:  # pragma: no cover - optional
+    ThreadedStreamer = None  # type: ignore
 
 # Do NOT import numpy/tensorflow up-front; import lazily only if required and files exist.
-np = None  # type: ignore
-tf = None  # type: ignore
-pad_sequences = None  # type: ignore
+# The module-level __getattr__ below binds `tf`, `np` and `pad_sequences` on first access.
+_tf = None  # type: ignore
+_np = None  # type: ignore
+_pad_sequences = None  # type: ignore
+# joblib for sklearn/xgb pipelines; imported by _joblib() once a model file is actually on disk
+_joblib_module: Any = None
+
+def _joblib() -> Any:
+    """Import joblib on first use and memoize it; None when it isn't installed."""
+    global _joblib_module
+    if _joblib_module is None:
+        try:
+            import joblib as _jl  # type: ignore
+        except Exception:  # pragma: no cover - optional
+            _jl = False
+        _joblib_module = _jl
+    return _joblib_module or None
+
+def _ensure_tf():
+    """Import TensorFlow, pad_sequences and NumPy once and memoize them in module globals."""
+    global _tf, _np, _pad_sequences
+    if _tf is None:
+        # Read by TensorFlow's C++ runtime at import/first session, so they must be set first
+        os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+        os.environ.setdefault('TF_NUM_INTRAOP_THREADS', os.environ.get('OMP_NUM_THREADS', '1'))
+        import numpy as _numpy  # type: ignore
+        import tensorflow as _tensorflow  # type: ignore
+        from tensorflow.keras.preprocessing.sequence import pad_sequences as _pad  # type: ignore
+        _tf, _np, _pad_sequences = _tensorflow, _numpy, _pad
+    return _tf, _pad_sequences, _np
+
+_LAZY_TF_ATTRS = {'tf': 0, 'pad_sequences': 1, 'np': 2}
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_TF_ATTRS:
+        value = _ensure_tf()[_LAZY_TF_ATTRS[name]]
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Serve files from the Public folder
 # static_url_path='' means static files are served from root ('/style.css', '/script.js')
 # Serve static from /static to prevent it from shadowing API routes like /predict_all
+def _json_loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 JSON bytes, ready to be used as a response body."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; numpy scalars and arrays serialize natively."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Skip the per-response key sort in jsonify (JSON_SORT_KEYS is ignored by Flask >= 2.3)
+app.json.sort_keys = False
+# Must be set before any route is registered: rules pick it up when they're added
+app.url_map.strict_slashes = False
 CORS(app)  # Enable CORS for all do
 
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-change-me')
 
-# OAuth (GitHub) setup
+# OAuth (GitHub) setup; authlib is only imported on the first login/callback request
 _oauth = None
-try:
-    from authlib.integrations.flask_client import OAuth  # type: ignore
-    _oauth = OAuth(app)
-    _oauth.register(
-        name='github',
-        client_id=os.environ.get('GITHUB_CLIENT_ID'),
-        client_secret=os.environ.get('GITHUB_CLIENT_SECRET'),
-        access_token_url='https://github.com/login/oauth/access_token',
-        authorize_url='https://github.com/login/oauth/authorize',
-        api_base_url='https://api.github.com/',
-        client_kwargs={'scope': 'read:user user:email'}
-    )
-except Exception as _e:  # pragma: no cover - optional dependency
-    print(f"[oauth] Authlib not available or failed to init: {_e}")
+_oauth_initialized = False
+_oauth_lock = threading.Lock()
+
+def _get_oauth():
+    """Return the GitHub OAuth client, creating it on first use; None if authlib is unavailable."""
+    global _oauth, _oauth_initialized
+    if _oauth_initialized:
+        return _oauth
+    with _oauth_lock:
+        if not _oauth_initialized:
+            try:
+                from authlib.integrations.flask_client import OAuth  # type: ignore
+                oauth = OAuth(app)
+                oauth.register(
+                    name='github',
+                    client_id=os.environ.get('GITHUB_CLIENT_ID'),
+                    client_secret=os.environ.get('GITHUB_CLIENT_SECRET'),
+                    access_token_url='https://github.com/login/oauth/access_token',
+                    authorize_url='https://github.com/login/oauth/authorize',
+                    api_base_url='https://api.github.com/',
+                    client_kwargs={'scope': 'read:user user:email'}
+                )
+                _oauth = oauth
+            except Exception as e:  # pragma: no cover - optional dependency
+                print(f"[oauth] Authlib not available or failed to init: {e}")
+            _oauth_initialized = True
+    return _oauth
+
+# FLASK_PROFILE=1: dump a cProfile file per request into ./profiles and print the top 30 entries
+if os.environ.get('FLASK_PROFILE') == '1':
+    from werkzeug.middleware.profiler import ProfilerMiddleware
+    os.makedirs('./profiles', exist_ok=True)
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, restrictions=[30], profile_dir='./profiles')
+
+# FLASK_METRICS=1: per-endpoint request rate/latency histograms for Prometheus
+if os.environ.get('FLASK_METRICS') == '1':
+    try:
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            # Gunicorn (set up by gunicorn.conf.py): workers write to a shared directory and the
+            # master serves the merged metrics on METRICS_PORT, so a scrape isn't just one worker's view
+            from prometheus_flask_exporter.multiprocess import GunicornPrometheusMetrics  # type: ignore
+            GunicornPrometheusMetrics(app)
+        else:
+            # Single process (python app.py): served on /metrics
+            from prometheus_flask_exporter import PrometheusMetrics  # type: ignore
+            PrometheusMetrics(app)
+    except Exception as _e:  # pragma: no cover - optional dependency
+        print(f"[metrics] prometheus_flask_exporter not available or failed to init: {_e}")
 
 
 # Supported languages
 SUPPORTED_LANGUAGES = ['en', 'es', 'fr', 'de', 'ar', 'hi', 'zh', 'ja', 'pt']
+_SUPPORTED_LANGUAGE_SET = frozenset(SUPPORTED_LANGUAGES)
 DEFAULT_LANGUAGE = 'en'
+_LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Public', 'locales')
+
+def _build_static_payloads() -> None:
+    """Serialize every locale file and the /api/languages body once.
+
+    Locale files don't change at runtime, so the i18n routes just return these bytes.
+    """
+    global _LANGUAGES_JSON_BYTES, _TRANSLATIONS_JSON_BYTES, _TRANSLATIONS_ETAGS, _TRANSLATIONS_ENCODED
+    translations: Dict[str, bytes] = {}
+    language_info: Dict[str, Dict[str, Any]] = {}
+    for lang in SUPPORTED_LANGUAGES:
+        try:
+            translations_path = os.path.join(_LOCALES_DIR, f'{lang}.json')
+            if os.path.exists(translations_path):
+                with open(translations_path, 'rb') as f:
+                    data = _json_loads(f.read())
+                translations[lang] = _json_dumps_bytes(data)
+                language_info[lang] = {
+                    'name': data.get('languages', {}).get(lang, lang.upper()),
+                    'available': True
+                }
+            else:
+                language_info[lang] = {'name': lang.upper(), 'available': False}
+        except Exception as e:
+            print(f"Error loading translations for {lang}: {e}")
+            language_info[lang] = {'name': lang.upper(), 'available': False}
+    _TRANSLATIONS_JSON_BYTES = translations
+    # Strong validators derived from the payload, so every worker hands out the same ETag
+    _TRANSLATIONS_ETAGS = {lang: hashlib.blake2b(body, digest_size=16).hexdigest() for lang, body in translations.items()}
+    # Compressed once here instead of per response; each encoding gets its own ETag since the bytes differ
+    encoded: Dict[str, Dict[str, Tuple[bytes, str]]] = {}
+    for lang, body in translations.items():
+        etag = _TRANSLATIONS_ETAGS[lang]
+        variants = {'gzip': (gzip.compress(body, compresslevel=9, mtime=0), f'{etag}-gzip')}
+        if brotli is not None:
+            variants['br'] = (brotli.compress(body, quality=11), f'{etag}-br')
+        encoded[lang] = variants
+    _TRANSLATIONS_ENCODED = encoded
+    _LANGUAGES_JSON_BYTES = _json_dumps_bytes({'supported': SUPPORTED_LANGUAGES, 'default': DEFAULT_LANGUAGE, 'languages': language_info})
+
+_LANGUAGES_JSON_BYTES: bytes = b''
+_TRANSLATIONS_JSON_BYTES: Dict[str, bytes] = {}
+_TRANSLATIONS_ETAGS: Dict[str, str] = {}
+_TRANSLATIONS_ENCODED: Dict[str, Dict[str, Tuple[bytes, str]]] = {}
+# Preference order when the client accepts several encodings with the same q-value
+_TRANSLATION_ENCODINGS = ['br', 'gzip']
+_build_static_payloads()
 
 # ------------------------------
 # Load the model
@@ -58,18 +233,32 @@ DEFAULT_LANGUAGE = 'en'
 # model = joblib.load(model_path)
 # ------------------------------
 
-def get_user_language():
-    """Detect user's preferred language from Accept-Language header or query parameter"""
+# Primary subtag of each Accept-Language entry ("en" in "en-GB;q=0.8"), never a region subtag; like the
+# old split(';')/split('-') parsing, it must end the entry or be followed by "-" ("en_US" is no match)
+_ACCEPT_LANGUAGE_RE = re.compile(r'(?:^|,)\s*([A-Za-z]{2,3})(?=-|\s*(?:[;,]|$))')
+
+def _detect_user_language() -> str:
     lang = request.args.get('lang', '').lower()
-    if lang in SUPPORTED_LANGUAGES:
+    if lang in _SUPPORTED_LANGUAGE_SET:
         return lang
-    if request.headers.get('Accept-Language'):
-        for lang_code in request.headers.get('Accept-Language', '').split(','):
-            lang = lang_code.split(';')[0].strip().split('-')[0].lower()
-            if lang in SUPPORTED_LANGUAGES:
+    header = request.headers.get('Accept-Language')
+    if header:
+        # Only the first few preferences matter; islice caps the work on oversized headers
+        for match in itertools.islice(_ACCEPT_LANGUAGE_RE.finditer(header), 16):
+            lang = match.group(1).lower()
+            if lang in _SUPPORTED_LANGUAGE_SET:
                 return lang
     return DEFAULT_LANGUAGE
 
+def get_user_language():
+    """Detect user's preferred language from Accept-Language header or query parameter.
+
+    The result is memoized on flask.g, so repeated calls within a request parse the header once.
+    """
+    if 'language' not in g:
+        g.language = _detect_user_language()
+    return g.language
+
 @app.route('/')
 def home():
     return render_template('index.html')
@@ -109,39 +298,54 @@ def index():
 @app.route('/api/translations/<lang_code>')
 def get_translations(lang_code):
     """API endpoint to fetch translation files"""
-    if lang_code not in SUPPORTED_LANGUAGES:
+    if lang_code not in _SUPPORTED_LANGUAGE_SET:
         return jsonify({'error': 'Unsupported language'}), 400
     try:
-        translations_path = os.path.join('Public', 'locales', f'{lang_code}.json')
-        if os.path.exists(translations_path):
-            with open(translations_path, 'r', encoding='utf-8') as f:
-                translations = json.load(f)
-            return jsonify(translations)
-        else:
+        body = _TRANSLATIONS_JSON_BYTES.get(lang_code)
+        if body is None:
             return jsonify({'error': 'Translation file not found'}), 404
+        etag = _TRANSLATIONS_ETAGS[lang_code]
+        variants = _TRANSLATIONS_ENCODED.get(lang_code, {})
+        encoding = request.accept_encodings.best_match([e for e in _TRANSLATION_ENCODINGS if e in variants])
+        if encoding is not None:
+            body, etag = variants[encoding]
+        # If-None-Match uses weak comparison (RFC 9110 13.1.2); proxies that recompress mark ETags W/
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding is not None:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
     except Exception as e:
-        print(f"Error loading translations for {lang_code}: {e}")
+        print(f"Error serving translations for {lang_code}: {e}")
         return jsonify({'error': 'Failed to load translations'}), 500
 @app.route('/login/github')
 def login_github():
-    if _oauth is None:
+    oauth = _get_oauth()
+    if oauth is None:
         return jsonify({'error': 'OAuth is not configured on server'}), 501
     redirect_uri = url_for('auth_github_callback', _external=True)
-    return _oauth.github.authorize_redirect(redirect_uri)
+    return oauth.github.authorize_redirect(redirect_uri)
 
 @app.route('/auth/github/callback')
 def auth_github_callback():
-    if _oauth is None:
+    oauth = _get_oauth()
+    if oauth is None:
         return redirect(url_for('index'))
     try:
-        token = _oauth.github.authorize_access_token()
-        resp = _oauth.github.get('user', token=token)
+        token = oauth.github.authorize_access_token()
+        resp = oauth.github.get('user', token=token)
         profile = resp.json() if resp is not None else {}
         # Get primary email if needed
         email = profile.get('email')
         if not email:
             try:
-                emails_resp = _oauth.github.get('user/emails', token=token)
+                emails_resp = oauth.github.get('user/emails', token=token)
                 if emails_resp and emails_resp.ok:
                     emails = emails_resp.json()
                     primary = next((e for e in emails if e.get('primary')), None)
@@ -173,140 +377,512 @@ def api_me():
 @app.route('/api/languages')
 def get_supported_languages():
     """API endpoint to get list of supported languages"""
-    language_info = {}
-    for lang in SUPPORTED_LANGUAGES:
-        try:
-            translations_path = os.path.join('Public', 'locales', f'{lang}.json')
-            if os.path.exists(translations_path):
-                with open(translations_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    language_info[lang] = {
-                        'name': data.get('languages', {}).get(lang, lang.upper()),
-                        'available': True
-                    }
-            else:
-                language_info[lang] = {'name': lang.upper(), 'available': False}
-        except Exception:
-            language_info[lang] = {'name': lang.upper(), 'available': False}
-    return jsonify({'supported': SUPPORTED_LANGUAGES, 'default': DEFAULT_LANGUAGE, 'languages': language_info})
+    return Response(_LANGUAGES_JSON_BYTES, mimetype='application/json')
 
 # ------------------------------
 # Model loading and inference utilities
 # ------------------------------
 
-_models_loaded: bool = False
-_models: Dict[str, Dict[str, Any]] = {}
+_MODULE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'module')
+# None until load_models_if_needed() has run; an empty dict means nothing could be loaded
+_models: Optional[Dict[str, Dict[str, Any]]] = None
+_pool: Optional[ThreadPoolExecutor] = None
+# {key: display name} of the loaded models, built once with _models and shared by every prediction
+_models_loaded: Dict[str, str] = {}
+_models_lock = threading.Lock()
+_streamer_lock = threading.Lock()
+_keras_lock = threading.Lock()
+_onnx_lock = threading.Lock()
+# Single background thread that loads the models while a /predict_all request is still fetching its URL
+_loader_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-loader')
+# Per-thread (1, maxlen) token buffer reused by single-text Keras predictions
+_pad_scratch = threading.local()
 
 def _sigmoid(x: float) -> float:
+    # exp() only overflows far outside this range, where the sigmoid is already 0.0 or 1.0
+    return 1.0 / (1.0 + math.exp(-x)) if -700.0 < x < 700.0 else (1.0 if x > 0 else 0.0)
+
+def _register_xgboost_onnx_converter() -> None:
+    """Teach skl2onnx how to convert XGBClassifier steps (needs onnxmltools and xgboost)."""
     try:
-        return 1.0 / (1.0 + math.exp(-float(x)))
+        from skl2onnx import update_registered_converter  # type: ignore
+        from skl2onnx.common.shape_calculator import calculate_linear_classifier_output_shapes  # type: ignore
+        from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost  # type: ignore
+        from xgboost import XGBClassifier  # type: ignore
     except Exception:
-        return 0.5
+        return
+    update_registered_converter(
+        XGBClassifier, 'XGBoostXGBClassifier',
+        calculate_linear_classifier_output_shapes, convert_xgboost,
+        options={'nocl': [True, False], 'zipmap': [True, False, 'columns']},
+    )
+
+def _export_onnx(model: Any, pkl_path: str) -> str:
+    """Compile a scikit-learn text pipeline to an ONNX graph and return its path.
+
+    The converted graph is written next to the pickle and reused while it is newer than the pickle.
+    """
+    onnx_path = os.path.splitext(pkl_path)[0] + '.onnx'
+    if not (os.path.isfile(onnx_path) and os.path.getmtime(onnx_path) >= os.path.getmtime(pkl_path)):
+        from skl2onnx import convert_sklearn  # type: ignore
+        from skl2onnx.common.data_types import StringTensorType  # type: ignore
+        _register_xgboost_onnx_converter()
+        clf = model.steps[-1][1] if hasattr(model, 'steps') else model
+        onx = convert_sklearn(model, initial_types=[('input', StringTensorType([None, 1]))], options={id(clf): {'zipmap': False}})
+        with open(onnx_path, 'wb') as f:
+            f.write(onx.SerializeToString())
+    return onnx_path
+
+def _onnx_session(info: Dict[str, Any]) -> Any:
+    """Return this process's onnxruntime session for a pipeline, creating it on first use; None if that failed.
+
+    A session starts its thread pool when it is created, and the pool doesn't survive a fork, so
+    sessions are built per worker process like the LSTM. One intra-op thread per session, matching
+    OMP/MKL_NUM_THREADS=1: the model pool's threads provide the parallelism.
+    """
+    pid = os.getpid()
+    state = info.get('onnx_session')
+    if state is None or state[0] != pid:
+        with _onnx_lock:
+            state = info.get('onnx_session')
+            if state is None or state[0] != pid:
+                sess = None
+                try:
+                    import onnxruntime as ort  # type: ignore
+                    options = ort.SessionOptions()
+                    options.intra_op_num_threads = 1
+                    options.inter_op_num_threads = 1
+                    sess = ort.InferenceSession(info['onnx_path'], sess_options=options, providers=['CPUExecutionProvider'])
+                except Exception as e:
+                    print(f"[load_models_if_needed] ONNX session failed for {info['name']}, using scikit-learn: {e}")
+                state = info['onnx_session'] = (pid, sess)
+    return state[1]
+
+def _share_featurizers(loaded: Dict[str, Dict[str, Any]]) -> None:
+    """Mark sklearn pipelines whose steps before the classifier are identical, so a request featurizes once.
+
+    Pipelines are unpickled separately, so identity is decided by the pickled bytes of pipeline[:-1].
+    Members of a shared group get info['featurizer'] = (digest, pipeline[:-1]).
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for info in loaded.values():
+        model = info.get('model')
+        if info['type'] != 'sklearn' or 'onnx_path' in info or len(getattr(model, 'steps', ())) < 2:
+            continue
+        try:
+            digest = hashlib.blake2b(pickle.dumps(model[:-1]), digest_size=16).hexdigest()
+        except Exception as e:
+            print(f"[load_models_if_needed] Can't fingerprint {info['name']} featurizer: {e}")
+            continue
+        groups.setdefault(digest, []).append(info)
+    for digest, members in groups.items():
+        if len(members) > 1:
+            featurizer = members[0]['model'][:-1]
+            for info in members:
+                info['featurizer'] = (digest, featurizer)
 
 def load_models_if_needed() -> Dict[str, Dict[str, Any]]:
-    global _models_loaded, _models
-    if _models_loaded:
+    if _models is not None:
         return _models
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    module_dir = os.path.join(base_dir, 'module')
+    # Concurrent first requests (PRELOAD_MODELS=0) would otherwise each load every model
+    with _models_lock:
+        if _models is None:
+            _load_models()
+    return _models
+
+def _load_models() -> None:
+    global _models, _pool, _models_loaded
+    module_dir = _MODULE_DIR
     candidates: List[Dict[str, Any]] = [
         {'key': 'lr', 'name': 'Logistic Regression', 'path': os.path.join(module_dir, 'model_pipeline_lr.pkl'), 'type': 'sklearn'},
         {'key': 'svm', 'name': 'Support Vector Machine', 'path': os.path.join(module_dir, 'model_pipeline_svm.pkl'), 'type': 'sklearn'},
         {'key': 'xgb', 'name': 'XGBoost', 'path': os.path.join(module_dir, 'model_pipeline_xgb.pkl'), 'type': 'sklearn'},
         {'key': 'base', 'name': 'Baseline Pipeline', 'path': os.path.join(module_dir, 'model_pipeline.pkl'), 'type': 'sklearn'},
-        {'key': 'lstm', 'name': 'LSTM (Keras)', 'path': os.path.join(module_dir, 'lstm_model.h5'), 'type': 'keras', 'tokenizer': os.path.join(module_dir, 'tokenizer.pkl'), 'maxlen': 200},
+        {'key': 'lstm', 'name': 'LSTM (Keras)', 'path': os.path.join(module_dir, 'lstm_model.h5'), 'type': 'keras', 'tokenizer': os.path.join(module_dir, 'tokenizer.pkl'), 'tflite': [os.path.join(module_dir, 'lstm_model_int8.tflite'), os.path.join(module_dir, 'lstm_model.tflite')], 'maxlen': 200},
     ]
     loaded: Dict[str, Dict[str, Any]] = {}
     for c in candidates:
         try:
             if c['type'] == 'sklearn':
-                if joblib is None or not os.path.isfile(c['path']):
+                joblib = _joblib() if os.path.isfile(c['path']) else None
+                if joblib is None:
                     continue
-                model = joblib.load(c['path'])
-                loaded[c['key']] = {**c, 'model': model}
-            elif c['type'] == 'keras':
-                if not os.path.isfile(c['path']) or not os.path.isfile(c['tokenizer']):
-                    continue
-                global tf, pad_sequences, np
-                if tf is None:
+                # mmap large numpy arrays read-only so forked workers share the same page-cache copy
+                model = joblib.load(c['path'], mmap_mode='r')
+                entry = {**c, 'model': model}
+                if os.environ.get('ONNX_INFERENCE') == '1' and hasattr(model, 'predict_proba'):
                     try:
-                        import tensorflow as tf  # type: ignore
-                        from tensorflow.keras.preprocessing.sequence import pad_sequences as _pad_sequences  # type: ignore
-                        pad_sequences = _pad_sequences
+                        # Only the graph is exported here; sessions are created per process by _onnx_session()
+                        entry['onnx_path'] = _export_onnx(model, c['path'])
                     except Exception as e:
-                        print(f"[load_models_if_needed] TensorFlow unavailable: {e}")
-                        continue
-                if np is None:
-                    try:
-                        import numpy as np  # type: ignore
-                    except Exception as e:
-                        print(f"[load_models_if_needed] NumPy unavailable: {e}")
-                        continue
-                model = tf.keras.models.load_model(c['path'])
-                tokenizer = joblib.load(c['tokenizer'])
-                loaded[c['key']] = {**c, 'model': model, 'tokenizer': tokenizer}
+                        print(f"[load_models_if_needed] ONNX conversion failed for {c['name']}, using scikit-learn: {e}")
+                loaded[c['key']] = entry
+            elif c['type'] == 'keras':
+                # Only the files are checked here: TensorFlow is imported and the model loaded per
+                # process by _keras_runtime(), since this may run in the Gunicorn master before the fork
+                # Exports from scripts/convert_lstm_tflite.py, most quantized first; preferred over the FP32 .h5
+                tflite_path = next((p for p in c['tflite'] if os.path.isfile(p)), None)
+                joblib = _joblib() if (tflite_path or os.path.isfile(c['path'])) and os.path.isfile(c['tokenizer']) else None
+                if joblib is None:
+                    continue
+                # Checked without importing it, so a worker never advertises a model it can't run
+                if importlib.util.find_spec('tensorflow') is None:
+                    print(f"[load_models_if_needed] Skipped {c['name']}: TensorFlow is not installed")
+                    continue
+                loaded[c['key']] = {**c, 'tflite_path': tflite_path}
         except Exception as e:
             print(f"[load_models_if_needed] Skipped {c.get('name')}: {e}")
             continue
+    _share_featurizers(loaded)
+    # The pool is shared by every request thread in the process: give each of them one slot per model,
+    # so concurrent requests don't queue behind each other and several single-text LSTM calls can be
+    # in flight at once for the ThreadedStreamer to batch
+    request_threads = int(os.environ.get('GUNICORN_THREADS', 4))
+    _pool = ThreadPoolExecutor(max_workers=max(1, len(loaded)) * request_threads, thread_name_prefix='model')
+    _models_loaded = {k: v['name'] for k, v in loaded.items()}
     _models = loaded
-    _models_loaded = True
-    return _models
+
+def _load_keras_runtime(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Import TensorFlow and load the tokenizer plus the TFLite interpreter (or traced Keras model)."""
+    tf, _, _ = _ensure_tf()
+    runtime: Dict[str, Any] = {'pid': os.getpid(), 'maxlen': info['maxlen'], 'tokenizer': _joblib().load(info['tokenizer'])}
+    if info['tflite_path']:
+        num_threads = int(os.environ.get('TFLITE_NUM_THREADS', os.cpu_count() or 1))
+        interpreter = tf.lite.Interpreter(model_path=info['tflite_path'], num_threads=num_threads)
+        interpreter.allocate_tensors()
+        runtime.update(interpreter=interpreter, interpreter_lock=threading.Lock())
+    else:
+        model = tf.keras.models.load_model(info['path'])
+        # Traced once for the fixed [batch, maxlen] int32 shape; calling it skips predict()'s
+        # per-call data adapter, callback and progress-bar machinery
+        runtime['infer'] = tf.function(
+            lambda x, _m=model: _m(x, training=False),
+            input_signature=[tf.TensorSpec([None, info['maxlen']], tf.int32)],
+        )
+    return runtime
+
+def _keras_runtime(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return this process's loaded LSTM for a Keras model entry, loading it on first use.
+
+    TensorFlow's thread pools (and XNNPACK's for TFLite) don't survive a fork, so unlike the
+    sklearn pipelines the LSTM is never loaded before it: every worker process loads its own.
+    A failed load is remembered for the process too, so later requests fail fast instead of
+    retrying load_model() one at a time behind _keras_lock.
+    """
+    pid = os.getpid()
+    runtime = info.get('runtime')
+    if runtime is None or runtime['pid'] != pid:
+        with _keras_lock:
+            runtime = info.get('runtime')
+            if runtime is None or runtime['pid'] != pid:
+                try:
+                    runtime = _load_keras_runtime(info)
+                except Exception as e:
+                    print(f"[load_models_if_needed] Failed to load {info['name']} in process {pid}: {e}")
+                    runtime = {'pid': pid, 'error': e}
+                info['runtime'] = runtime
+    if 'error' in runtime:
+        raise RuntimeError(f"{info['name']} failed to load: {runtime['error']}")
+    return runtime
+
+def _pad_texts(info: Dict[str, Any], texts: List[str]) -> Any:
+    """Tokenize texts into a (len(texts), maxlen) int32 array, post-padded and post-truncated."""
+    _, pad_sequences, np = _ensure_tf()
+    maxlen = info.get('maxlen', 200)
+    # Only the first `maxlen` tokens survive padding, so don't tokenize far past them (~8 chars per token)
+    char_cap = maxlen * 8
+    if len(texts) == 1:
+        # Single text: write tokens straight into a per-thread scratch row instead of building a new array
+        buf = getattr(_pad_scratch, 'buf', None)
+        if buf is None or buf.shape[1] != maxlen:
+            buf = _pad_scratch.buf = np.zeros((1, maxlen), dtype=np.int32)
+        seq = info['tokenizer'].texts_to_sequences([texts[0][:char_cap]])[0][:maxlen]
+        buf[0, :len(seq)] = seq
+        buf[0, len(seq):] = 0
+        return buf
+    seq = info['tokenizer'].texts_to_sequences([t[:char_cap] for t in texts])
+    return pad_sequences(seq, maxlen=maxlen, padding='post', truncating='post')
+
+def _tflite_predict(info: Dict[str, Any], pad: Any) -> List[float]:
+    """Run padded rows through the TFLite interpreter one at a time (its input batch is fixed at 1).
+
+    Handles fully-quantized (int8) exports: inputs are quantized and outputs dequantized
+    with the tensors' own (scale, zero_point).
+    """
+    _, _, np = _ensure_tf()
+    interpreter = info['interpreter']
+    in_detail = interpreter.get_input_details()[0]
+    out_detail = interpreter.get_output_details()[0]
+    in_scale, in_zero = in_detail['quantization']
+    out_scale, out_zero = out_detail['quantization']
+    rows = pad
+    if in_scale and np.issubdtype(in_detail['dtype'], np.integer):
+        rows = np.round(pad / in_scale + in_zero)
+    rows = rows.astype(in_detail['dtype'], copy=False)
+    probs: List[float] = []
+    # An interpreter holds mutable tensor state and isn't thread-safe
+    with info['interpreter_lock']:
+        for i in range(len(rows)):
+            interpreter.set_tensor(in_detail['index'], rows[i:i + 1])
+            interpreter.invoke()
+            out = float(interpreter.get_tensor(out_detail['index'])[0][0])
+            probs.append((out - out_zero) * out_scale if out_scale and np.issubdtype(out_detail['dtype'], np.integer) else out)
+    return probs
+
+def _keras_batch_predict(info: Dict[str, Any], texts: List[str]) -> List[float]:
+    """Tokenize and pad a whole batch of texts, then run a single model call."""
+    runtime = _keras_runtime(info)
+    pad = _pad_texts(runtime, texts)
+    if 'interpreter' in runtime:
+        return _tflite_predict(runtime, pad)
+    tf, _, _ = _ensure_tf()
+    preds = runtime['infer'](tf.constant(pad, dtype=tf.int32)).numpy()
+    return [float(p[0]) for p in preds]
+
+def _get_streamer(info: Dict[str, Any]) -> Any:
+    """Return this process's ThreadedStreamer for a Keras model, creating it on first use.
+
+    The streamer owns a background thread, which does not survive a fork, so it is created
+    lazily per worker process rather than at load time (models may be preloaded in the master).
+    """
+    if ThreadedStreamer is None:
+        return None
+    pid = os.getpid()
+    if info.get('streamer_pid') != pid:
+        with _streamer_lock:
+            if info.get('streamer_pid') != pid:
+                info['streamer'] = ThreadedStreamer(functools.partial(_keras_batch_predict, info), batch_size=32, max_latency=0.05)
+                info['streamer_pid'] = pid
+    return info['streamer']
+
+def _model_probabilities(info: Dict[str, Any], texts: List[str], features: Any = None) -> List[float]:
+    """Probability of the 'true' class for every text, computed with one batched model call.
+
+    `features` are the texts already run through this pipeline's shared featurizer, if any.
+    """
+    if info['type'] == 'sklearn':
+        sess = _onnx_session(info) if 'onnx_path' in info else None
+        if sess is not None:
+            import numpy as np  # type: ignore
+            # Outputs are (label, probabilities) since the classifier was converted with zipmap disabled
+            _, probs = sess.run(None, {'input': np.array(texts, dtype=object).reshape(-1, 1)})
+            return [float(p[1]) if len(p) > 1 else float(p[0]) for p in probs]
+        model = info['model']
+        if features is not None:
+            model, texts = model.steps[-1][1], features
+        if hasattr(model, 'predict_proba'):
+            return [float(p[1]) if len(p) > 1 else float(p[0]) for p in model.predict_proba(texts)]
+        if hasattr(model, 'decision_function'):
+            raw = model.decision_function(texts)
+            try:
+                from scipy.special import expit  # type: ignore
+            except ImportError:
+                return [_sigmoid(float(r)) for r in raw]
+            return expit(raw).tolist()
+        return [0.65 if int(pred) == 1 else 0.35 for pred in model.predict(texts)]
+    if info['type'] == 'keras':
+        streamer = _get_streamer(info)
+        if streamer is not None and len(texts) == 1:
+            return [float(streamer.predict(texts)[0])]
+        return _keras_batch_predict(info, texts)
+    raise ValueError(f"Unknown model type: {info['type']}")
+
+def _run_one(key: str, info: Dict[str, Any], texts: List[str], features: Any = None) -> Optional[List[Dict[str, Any]]]:
+    """Run a single loaded model on a batch of texts; returns None if the model fails."""
+    name = info['name']
+    try:
+        probas = _model_probabilities(info, texts, features)
+    except Exception as e:
+        print(f"[predict_with_all_models] {name} failed: {e}")
+        return None
+    return [{'model': name, 'key': key, 'prediction': 1 if p >= 0.5 else 0, 'confidence': p, 'source': info['type']} for p in probas]
+
+# Placeholder ensemble returned when no model could be loaded (clearly marked with source='mock')
+_MOCK_RESULTS: List[Dict[str, Any]] = [
+    {'model': name, 'key': f'mock_{i}', 'prediction': pred, 'confidence': conf, 'source': 'mock'}
+    for i, (name, pred, conf) in enumerate([
+        ('Logistic Regression', 1, 0.62),
+        ('Support Vector Machine', 0, 0.58),
+        ('XGBoost', 1, 0.66),
+        ('Naive Bayes', 0, 0.57),
+        ('LSTM (Keras)', 1, 0.60),
+    ])
+]
+_MOCK_BEST_IDX = max(range(len(_MOCK_RESULTS)), key=lambda i: _MOCK_RESULTS[i]['confidence'])
+
+def _submit_all_models(models: Dict[str, Dict[str, Any]], texts: List[str]) -> List[Any]:
+    """Submit one _run_one future per model to the pool, in the models' order."""
+    # Run each shared featurizer (e.g. one TF-IDF vectorizer used by several pipelines) once for the batch
+    features: Dict[str, Any] = {}
+    for info in models.values():
+        if 'featurizer' not in info:
+            continue
+        digest, featurizer = info['featurizer']
+        if digest not in features:
+            try:
+                features[digest] = featurizer.transform(texts)
+            except Exception as e:
+                print(f"[predict_with_all_models] Shared featurizer failed, pipelines will featurize on their own: {e}")
+                features[digest] = None
+    return [
+        _pool.submit(_run_one, key, info, texts, features[info['featurizer'][0]] if 'featurizer' in info else None)
+        for key, info in models.items()
+    ]
+
+def predict_batch_with_all_models(texts: List[str]) -> List[Dict[str, Any]]:
+    """Predict a list of texts with every model; each model sees the whole batch in one call."""
+    models = load_models_if_needed()
+    per_model: List[List[Dict[str, Any]]] = []
+    if models and _pool is not None:
+        per_model = [r for r in (f.result() for f in _submit_all_models(models, texts)) if r is not None]
+    models_loaded = _models_loaded
+    if per_model:
+        import numpy as np  # type: ignore  # already imported by any loaded model
+        # (models x texts) confidence matrix; a single argmax picks the best model for every text
+        conf = np.fromiter((r['confidence'] for rows in per_model for r in rows), dtype=np.float64, count=len(per_model) * len(texts))
+        best_indices = conf.reshape(len(per_model), len(texts)).argmax(axis=0).tolist()
+    predictions: List[Dict[str, Any]] = []
+    for row, text in enumerate(texts):
+        if per_model:
+            results = [rows[row] for rows in per_model]
+            best_idx = best_indices[row]
+        else:
+            # Shallow copies so callers can't mutate the shared placeholders
+            results = [dict(r) for r in _MOCK_RESULTS]
+            best_idx = _MOCK_BEST_IDX
+        best = {**results[best_idx], 'index': best_idx}
+        predictions.append({'input_text': text, 'results': results, 'best': best, 'models_loaded': models_loaded})
+    return predictions
 
 def predict_with_all_models(text: str) -> Dict[str, Any]:
+    return predict_batch_with_all_models([text])[0]
+
+def iter_predictions_with_all_models(text: str) -> Iterator[Dict[str, Any]]:
+    """Streaming counterpart of predict_with_all_models.
+
+    Yields {'result': ...} for each model as soon as it finishes (fastest first), then one
+    {'input_text', 'best', 'models_loaded'} summary whose 'best' is identified by its 'key'.
+    Models are loaded and submitted before this returns, so load failures surface to the caller
+    instead of inside an already-started response.
+    """
     models = load_models_if_needed()
+    futures = _submit_all_models(models, [text]) if models and _pool is not None else []
+    return _iter_completed_predictions(text, futures)
+
+def _iter_completed_predictions(text: str, futures: List[Any]) -> Iterator[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
+    for fut in as_completed(futures):
+        rows = fut.result()
+        if rows is not None:
+            results.append(rows[0])
+            yield {'result': rows[0]}
+    if not results:
+        results = [dict(r) for r in _MOCK_RESULTS]
+        for r in results:
+            yield {'result': r}
+    yield {'input_text': text, 'best': max(results, key=lambda r: r['confidence']), 'models_loaded': _models_loaded}
+
+# Keys are the (<= MAX_TEXT_LEN char) texts themselves, shared with each result's 'input_text', so the
+# cache holds at most ~1024 x 10k chars (~10 MB ASCII, up to 4x that for non-Latin text) per worker
+_PREDICT_CACHE_SIZE = 1024
+_predict_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+_predict_cache_lock = threading.Lock()
+
+def _predict_cached(text: str) -> Dict[str, Any]:
+    """Memoized predict_with_all_models; repeated submissions of the same text skip inference.
+
+    Only results every loaded model contributed to are kept, so a transient model failure
+    isn't served from the cache afterwards. Callers must treat the returned dict as read-only
+    since it is shared between requests.
+    """
+    with _predict_cache_lock:
+        result = _predict_cache.get(text)
+        if result is not None:
+            _predict_cache.move_to_end(text)
+            return result
+    result = predict_with_all_models(text)
+    models_loaded = result['models_loaded']
+    complete = not models_loaded or (len(result['results']) == len(models_loaded) and result['results'][0]['source'] != 'mock')
+    if complete:
+        with _predict_cache_lock:
+            _predict_cache[text] = result
+            if len(_predict_cache) > _PREDICT_CACHE_SIZE:
+                _predict_cache.popitem(last=False)
+    return result
+
+def _runs_per_process(info: Dict[str, Any]) -> bool:
+    """True for models whose runtime owns threads that don't survive a fork (TensorFlow, onnxruntime)."""
+    return info['type'] == 'keras' or 'onnx_path' in info
+
+def _warmup(per_process: bool = False) -> None:
+    """Load the models and run one throwaway inference so the first request doesn't pay for it.
+
+    By default only the fork-safe models are warmed (this runs in the Gunicorn master under
+    preload); per_process=True warms the TensorFlow/onnxruntime ones in the current process.
+    """
+    try:
+        models = load_models_if_needed()
+    except Exception as e:
+        print(f"[warmup] Model loading failed: {e}")
+        return
     for key, info in models.items():
-        name = info['name']
-        mtype = info['type']
+        if _runs_per_process(info) != per_process:
+            continue
         try:
-            if mtype == 'sklearn':
-                model = info['model']
-                proba = None
-                if hasattr(model, 'predict_proba'):
-                    p = model.predict_proba([text])[0]
-                    proba = float(p[1]) if len(p) > 1 else float(p[0])
-                elif hasattr(model, 'decision_function'):
-                    df = model.decision_function([text])
-                    raw = float(df[0]) if hasattr(df, '__getitem__') else float(df)
-                    proba = _sigmoid(raw)
-                else:
-                    pred = int(model.predict([text])[0])
-                    proba = 0.65 if pred == 1 else 0.35
-                pred_label = 1 if proba >= 0.5 else 0
-                results.append({'model': name, 'key': key, 'prediction': pred_label, 'confidence': proba, 'source': 'sklearn'})
-            elif mtype == 'keras':
-                model = info['model']
-                tokenizer = info['tokenizer']
-                maxlen = info.get('maxlen', 200)
-                if np is None or pad_sequences is None:
-                    continue
-                seq = tokenizer.texts_to_sequences([text])
-                pad = pad_sequences(seq, maxlen=maxlen, padding='post', truncating='post')
-                prob_true = float(model.predict(pad, verbose=0)[0][0])
-                pred_label = 1 if prob_true >= 0.5 else 0
-                results.append({'model': name, 'key': key, 'prediction': pred_label, 'confidence': prob_true, 'source': 'keras'})
+            if info['type'] == 'keras':
+                _keras_batch_predict(info, ['warmup'])
+            else:
+                _model_probabilities(info, ['warmup'])
         except Exception as e:
-            print(f"[predict_with_all_models] {name} failed: {e}")
-            continue
-    if not results:
-        import random
-        mock_names = ['Logistic Regression', 'Support Vector Machine', 'XGBoost', 'Naive Bayes', 'LSTM (Keras)']
-        for i, name in enumerate(mock_names):
-            conf = 0.55 + random.random() * 0.4
-            pred = 1 if random.random() > 0.5 else 0
-            results.append({'model': name, 'key': f'mock_{i}', 'prediction': pred, 'confidence': conf, 'source': 'mock'})
-    best_idx = max(range(len(results)), key=lambda i: results[i]['confidence'])
-    best = {**results[best_idx], 'index': best_idx}
-    return {'input_text': text, 'results': results, 'best': best, 'models_loaded': {k: v['name'] for k, v in load_models_if_needed().items()}}
+            print(f"[warmup] {info.get('name', key)} failed: {e}")
+
 
 # ------------------------------
 # PREDICTION ROUTES
 # ------------------------------
 
+def _error_body(message: str) -> bytes:
+    return _json_dumps_bytes({'error': message})
+
+# Pre-serialized bodies for the common error paths; wrapped in a fresh Response per request
+_ERR_MISSING_INPUT = _error_body('⚠️ Please provide text or URL to check.')
+_ERR_INVALID_JSON = _error_body('⚠️ Request body must be a JSON object.')
+_ERR_INTERNAL = _error_body('Internal server error.')
+_ERR_BAD_REQUEST = _error_body('Bad request.')
+
+def _error_response(body: bytes, status: int) -> Response:
+    return Response(body, status=status, mimetype='application/json')
+
+@app.errorhandler(BadRequest)
+def bad_request(e):
+    """JSON 400s for API clients instead of Werkzeug's HTML error page."""
+    return _error_response(_ERR_BAD_REQUEST, 400)
+
+# Upper bounds on the work a single request can ask for
+MAX_TEXT_LEN = 10_000
+MAX_BATCH_TEXTS = 100
+
+_FAKE_KEYWORDS = frozenset(['fake', 'hoax', 'conspiracy', 'secret', 'hidden truth', 'they don\'t want you to know'])
+_REAL_KEYWORDS = frozenset(['study', 'research', 'published', 'university', 'official', 'confirmed'])
+# Zero-width lookahead tries every position, so overlapping keywords ("hidden truthoax") are all found,
+# matching the old per-keyword substring test; longest first for keywords sharing a start position
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(re.escape(k) for k in sorted(_FAKE_KEYWORDS | _REAL_KEYWORDS, key=len, reverse=True)) + '))')
+
+def _keyword_scores(text: str) -> Tuple[int, int]:
+    """Returns (fake, real) counts of the distinct keywords found in text, using one regex scan."""
+    matched = set(_KEYWORD_RE.findall(text.lower()))
+    fake_score = len(matched & _FAKE_KEYWORDS)
+    return fake_score, len(matched) - fake_score
+
+# Bound method of a module-level generator: one C call per draw, no per-request import or list
+_mock_random = random.Random().random
+
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
-        data = request.get_json(force=True)
+        data = request.get_json(force=True, silent=True)
+        if not isinstance(data, dict):
+            return _error_response(_ERR_INVALID_JSON, 400)
 
         # --- NEW: Handle URL input ---
         text = data.get('text', '').strip()
@@ -317,15 +893,11 @@ def predict():
         elif text:
             text_to_check = text
         else:
-            return jsonify({'error': '⚠️ Please provide text or URL to check.'}), 400
+            return _error_response(_ERR_MISSING_INPUT, 400)
+        text_to_check = text_to_check[:MAX_TEXT_LEN]
 
         # Mock prediction logic (keep original)
-        import random
-        fake_keywords = ['fake', 'hoax', 'conspiracy', 'secret', 'hidden truth', 'they don\'t want you to know']
-        real_keywords = ['study', 'research', 'published', 'university', 'official', 'confirmed']
-        text_lower = text_to_check.lower()
-        fake_score = sum(1 for keyword in fake_keywords if keyword in text_lower)
-        real_score = sum(1 for keyword in real_keywords if keyword in text_lower)
+        fake_score, real_score = _keyword_scores(text_to_check)
         if fake_score > real_score:
             is_real = False
             base_confidence = 0.7 + (fake_score * 0.1)
@@ -333,9 +905,9 @@ def predict():
             is_real = True
             base_confidence = 0.7 + (real_score * 0.1)
         else:
-            is_real = random.choice([True, False])
+            is_real = _mock_random() < 0.5
             base_confidence = 0.6
-        confidence = min(0.95, max(0.55, base_confidence + random.uniform(-0.1, 0.1)))
+        confidence = min(0.95, max(0.55, base_confidence + (_mock_random() - 0.5) * 0.2))
         result_message = "LIKELY REAL" if is_real else "LIKELY FAKE"
         return jsonify({
             'prediction': 1 if is_real else 0,
@@ -345,33 +917,64 @@ def predict():
         })
     except Exception as e:
         print(f"Error in /predict: {e}")
-        return jsonify({'error': 'Internal server error.'}), 500
+        return _error_response(_ERR_INTERNAL, 500)
 
 @app.route('/predict_all', methods=['GET', 'POST'])
 def predict_all():
     """Return predictions from all available models plus the best pick."""
     try:
         if request.method == 'GET':
-            return jsonify({'message': 'Use POST with JSON body {"text": "..."} or {"url": "..."} to get predictions.', 'ok': True, 'endpoint': '/predict_all'})
-        data = request.get_json(force=True)
+            return jsonify({'message': 'Use POST with JSON body {"text": "..."}, {"texts": [...]} or {"url": "..."} to get predictions; add ?stream=1 for NDJSON, one line per model.', 'ok': True, 'endpoint': '/predict_all'})
+        data = request.get_json(force=True, silent=True)
+        if not isinstance(data, dict):
+            return _error_response(_ERR_INVALID_JSON, 400)
+        texts = data.get('texts')
+        if texts is not None:
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                return jsonify({'error': '⚠️ "texts" must be a list of strings.'}), 400
+            if len(texts) > MAX_BATCH_TEXTS:
+                return jsonify({'error': f'⚠️ At most {MAX_BATCH_TEXTS} texts can be checked per request.'}), 400
+            texts = [t.strip()[:MAX_TEXT_LEN] for t in texts]
+            if not texts or not all(texts):
+                return jsonify({'error': '⚠️ Please provide non-empty texts to check.'}), 400
+            return jsonify({'predictions': predict_batch_with_all_models(texts)})
         text = data.get('text', '').strip()
         url = data.get('url', '').strip()
         if url:
+            if _models is None:
+                # Overlap model loading with the network fetch; a load error resurfaces in load_models_if_needed()
+                _loader_pool.submit(load_models_if_needed)
             text_to_check = get_text_from_url(url)
         elif text:
             text_to_check = text
         else:
-            return jsonify({'error': '⚠️ Please provide text or URL to check.'}), 400
-        result = predict_with_all_models(text_to_check)
+            return _error_response(_ERR_MISSING_INPUT, 400)
+        text_to_check = text_to_check[:MAX_TEXT_LEN]
+        # Opt-in NDJSON: one line per model as it completes, so the first byte follows the fastest model
+        if request.args.get('stream') == '1' or request.accept_mimetypes.best == 'application/x-ndjson':
+            predictions = iter_predictions_with_all_models(text_to_check)
+            lines = (_json_dumps_bytes(item) + b'\n' for item in predictions)
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+        result = _predict_cached(text_to_check)
         return jsonify(result)
     except Exception as e:
         print(f"Error in /predict_all: {e}")
-        return jsonify({'error': 'Internal server error.'}), 500
+        return _error_response(_ERR_INTERNAL, 500)
 
 @app.errorhandler(404)
 def page_not_found(e):
     return render_template('404.html'), 404
 
+# Load and warm the sklearn pipelines at import so the first request doesn't pay for it. Under
+# `gunicorn --preload` this runs once in the master and workers share the models copy-on-write.
+# The LSTM and ONNX sessions are warmed per worker instead (post_fork in gunicorn.conf.py),
+# since TensorFlow and onnxruntime thread pools can't be forked.
+if os.environ.get('PRELOAD_MODELS', '1') == '1':
+    with app.app_context():
+        _warmup()
+
 if __name__ == '__main__':
+    if os.environ.get('PRELOAD_MODELS', '1') == '1':
+        _warmup(per_process=True)
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,51 @@
+# Gunicorn configuration (picked up automatically by `gunicorn app:app` from the project root)
+import os
+import shutil
+import tempfile
+
+# Keep BLAS/OpenMP single-threaded per call; request threads provide the parallelism.
+# Set here as well as in app.py so it is in place before the app (and numpy) is imported.
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
+# Threaded workers: sklearn/TensorFlow release the GIL inside their C kernels,
+# so concurrent requests overlap instead of queueing behind each other.
+worker_class = 'gthread'
+# Half the cores as processes and 4 threads each: inference in one thread overlaps I/O
+# (URL fetches, translation requests) in the others without oversubscribing the CPU.
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, (os.cpu_count() or 1) // 2)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Load app.py (and the models) once in the master; workers share the pages copy-on-write.
+preload_app = True
+
+# Model warmup can take a while on a cold start
+timeout = 120
+
+# FLASK_METRICS=1: Prometheus counters live per process, so workers record into a shared
+# directory (wiped at startup) and the master serves the merged view on METRICS_PORT
+_metrics = os.environ.get('FLASK_METRICS') == '1'
+if _metrics:
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'qfc_prometheus'))
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'])
+
+
+def when_ready(server):
+    if _metrics:
+        from prometheus_flask_exporter.multiprocess import GunicornPrometheusMetrics
+        GunicornPrometheusMetrics.start_http_server_when_ready(int(os.environ.get('METRICS_PORT', 9200)))
+
+
+def child_exit(server, worker):
+    if _metrics:
+        from prometheus_flask_exporter.multiprocess import GunicornPrometheusMetrics
+        GunicornPrometheusMetrics.mark_process_dead_on_child_exit(worker.pid)
+
+
+def post_fork(server, worker):
+    # TensorFlow's and onnxruntime's thread pools don't survive a fork, so app.py only preloads
+    # the sklearn pipelines in the master; each worker loads and warms its own LSTM/ONNX sessions here
+    if os.environ.get('PRELOAD_MODELS', '1') == '1':
+        from app import _warmup
+        _warmup(per_process=True)
@@ -0,0 +1,97 @@
+"""
+Offline export of the Keras LSTM (module/lstm_model.h5) to a quantized TFLite model.
+
+app.py prefers module/lstm_model_int8.tflite, then module/lstm_model.tflite, over the .h5
+when they exist, which skips Keras' predict() dispatch and runs int8 kernels on CPU.
+
+Usage:
+    python scripts/convert_lstm_tflite.py            # dynamic-range quantization -> lstm_model.tflite
+    python scripts/convert_lstm_tflite.py --int8     # full int8 quantization     -> lstm_model_int8.tflite
+"""
+import argparse
+import csv
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MODULE_DIR = ROOT_DIR / "module"
+DEFAULT_H5 = MODULE_DIR / "lstm_model.h5"
+DEFAULT_TOKENIZER = MODULE_DIR / "tokenizer.pkl"
+DEFAULT_TFLITE = MODULE_DIR / "lstm_model.tflite"
+DEFAULT_INT8_TFLITE = MODULE_DIR / "lstm_model_int8.tflite"
+CALIBRATION_TSV = MODULE_DIR / "dataset" / "liar" / "train.tsv"
+MAXLEN = 200
+
+
+def load_calibration_texts(tsv_path=CALIBRATION_TSV, limit=500):
+    """
+    Reads up to `limit` statements (3rd column) from the LIAR training split
+    to calibrate activation ranges for int8 quantization.
+    """
+    texts = []
+    with open(tsv_path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) > 2 and row[2].strip():
+                texts.append(row[2])
+            if len(texts) >= limit:
+                break
+    return texts
+
+
+def convert_lstm_to_tflite(h5_path=DEFAULT_H5, out_path=DEFAULT_TFLITE, int8=False, tokenizer_path=DEFAULT_TOKENIZER):
+    """
+    Converts the Keras model and writes the flatbuffer.
+
+    Without `int8`: post-training dynamic-range quantization (int8 weights, float activations).
+    With `int8`: full integer quantization of weights and activations, calibrated on LIAR
+    statements; inputs/outputs stay float so app.py can feed padded token ids directly.
+    """
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import joblib
+    import numpy as np
+    import tensorflow as tf
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+    model = tf.keras.models.load_model(h5_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if int8:
+        tokenizer = joblib.load(tokenizer_path)
+        seqs = tokenizer.texts_to_sequences(load_calibration_texts())
+        calibration = pad_sequences(seqs, maxlen=MAXLEN, padding="post", truncating="post")
+        input_dtype = model.inputs[0].dtype.as_numpy_dtype
+
+        def representative_dataset():
+            for row in calibration:
+                yield [np.asarray(row[None, :], dtype=input_dtype)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    else:
+        # Fall back to TF ops for any LSTM pieces without a TFLite builtin kernel
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+
+    tflite_model = converter.convert()
+
+    Path(out_path).write_bytes(tflite_model)
+    print(f"✅ Wrote {out_path} ({len(tflite_model) / 1024:.0f} KiB, from {os.path.getsize(h5_path) / 1024:.0f} KiB .h5)")
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the Keras LSTM to a quantized TFLite model.")
+    parser.add_argument("h5", nargs="?", default=DEFAULT_H5, help="path to the Keras .h5 model")
+    parser.add_argument("out", nargs="?", default=None, help="output .tflite path")
+    parser.add_argument("--int8", action="store_true", help="full int8 quantization with a representative dataset")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.h5):
+        print(f"🛑 Keras model not found at: {args.h5}")
+        sys.exit(1)
+    if args.int8 and not os.path.isfile(DEFAULT_TOKENIZER):
+        print(f"🛑 Tokenizer (needed for calibration) not found at: {DEFAULT_TOKENIZER}")
+        sys.exit(1)
+    out = args.out or (DEFAULT_INT8_TFLITE if args.int8 else DEFAULT_TFLITE)
+    convert_lstm_to_tflite(args.h5, out, int8=args.int8)
@@ -26,3 +26,180 @@ def test_predict_missing_text(client):
     assert response.status_code == 400
     data = response.get_json()
     assert "error" in data
+
+def test_predict_all_batch_texts(client):
+    response = client.post("/predict_all", json={"texts": ["first claim", "second claim"]})
+    assert response.status_code == 200
+    predictions = response.get_json()["predictions"]
+    assert [p["input_text"] for p in predictions] == ["first claim", "second claim"]
+    assert all("best" in p for p in predictions)
+
+def test_predict_all_batch_rejects_non_list(client):
+    response = client.post("/predict_all", json={"texts": "not a list"})
+    assert response.status_code == 400
+
+def test_translations_endpoint(client):
+    response = client.get("/api/translations/en")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert isinstance(response.get_json(), dict)
+
+def test_translations_unsupported_language(client):
+    response = client.get("/api/translations/xx")
+    assert response.status_code == 400
+
+def test_supported_languages(client):
+    data = client.get("/api/languages").get_json()
+    assert data["default"] == "en"
+    assert data["languages"]["en"]["available"] is True
+
+def test_translations_conditional_request(client):
+    first = client.get("/api/translations/en")
+    assert first.headers.get("ETag")
+    second = client.get("/api/translations/en", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    # A weak validator for the same representation still matches
+    weak = client.get("/api/translations/en", headers={"If-None-Match": "W/" + first.headers["ETag"]})
+    assert weak.status_code == 304
+
+def test_translations_gzip_encoding(client):
+    import gzip, json
+    response = client.get("/api/translations/en", headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert "Accept-Encoding" in response.headers.get("Vary", "")
+    assert json.loads(gzip.decompress(response.data))
+
+def test_predict_all_truncates_long_text(client):
+    from app import MAX_TEXT_LEN
+    response = client.post("/predict_all", json={"text": "a" * (MAX_TEXT_LEN + 500)})
+    assert response.status_code == 200
+    assert len(response.get_json()["input_text"]) == MAX_TEXT_LEN
+
+def test_predict_invalid_json(client):
+    response = client.post("/predict", data="not json", content_type="application/json")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+def test_predict_all_stream_ndjson(client):
+    import json
+    response = client.post("/predict_all?stream=1", json={"text": "hello world"})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    assert all("result" in line for line in lines[:-1])
+    assert lines[-1]["input_text"] == "hello world" and "best" in lines[-1]
+    assert "index" not in lines[-1]["best"]
+    assert lines[-1]["best"]["key"] in {line["result"]["key"] for line in lines[:-1]}
+
+def test_predict_all_stream_load_failure_is_500(client, monkeypatch):
+    import app as app_module
+    def broken():
+        raise RuntimeError("model files unreadable")
+    monkeypatch.setattr(app_module, "load_models_if_needed", broken)
+    response = client.post("/predict_all?stream=1", json={"text": "hello world"})
+    assert response.status_code == 500
+
+def test_shared_featurizer_matches_pipelines(tmp_path, monkeypatch):
+    pytest.importorskip("sklearn")
+    import joblib
+    import app as app_module
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    texts = ["the study was published", "secret hoax they hide", "official research confirmed", "fake conspiracy news"]
+    labels = [1, 0, 1, 0]
+    pipelines = {}
+    for key, c in (("lr", 1.0), ("svm", 0.1)):
+        pipelines[key] = Pipeline([("tfidf", TfidfVectorizer()), ("clf", LogisticRegression(C=c))]).fit(texts, labels)
+        joblib.dump(pipelines[key], tmp_path / f"model_pipeline_{key}.pkl")
+
+    monkeypatch.setattr(app_module, "_MODULE_DIR", str(tmp_path))
+    for name in ("_models", "_pool", "_models_loaded"):
+        monkeypatch.setattr(app_module, name, getattr(app_module, name))
+    app_module._models = None
+    models = app_module.load_models_if_needed()
+
+    assert set(models) == {"lr", "svm"}
+    assert models["lr"]["featurizer"][0] == models["svm"]["featurizer"][0]
+    queries = ["a new study", "hoax news"]
+    for prediction, query in zip(app_module.predict_batch_with_all_models(queries), queries):
+        for result in prediction["results"]:
+            expected = pipelines[result["key"]].predict_proba([query])[0][1]
+            assert result["confidence"] == pytest.approx(expected)
+
+@pytest.mark.parametrize("text", [
+    "hidden truthoax",
+    "secrethey don't want you to know",
+    "A Published STUDY, fake fake fake",
+    "nothing to see here",
+])
+def test_keyword_scores_match_substring_baseline(text):
+    import app as app_module
+    lower = text.lower()
+    expected = (sum(k in lower for k in app_module._FAKE_KEYWORDS), sum(k in lower for k in app_module._REAL_KEYWORDS))
+    assert app_module._keyword_scores(text) == expected
+
+def test_keyword_scores_overlapping_keywords():
+    import app as app_module
+    assert app_module._keyword_scores("hidden truthoax") == (2, 0)
+
+def test_keras_runtime_failure_is_not_retried(monkeypatch):
+    import app as app_module
+    calls = []
+
+    def failing_load(info):
+        calls.append(info["key"])
+        raise OSError("corrupt model")
+
+    monkeypatch.setattr(app_module, "_load_keras_runtime", failing_load)
+    info = {"key": "lstm", "name": "LSTM", "type": "keras"}
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="corrupt model"):
+            app_module._keras_runtime(info)
+    assert calls == ["lstm"]
+
+def _split_accept_language(header):
+    """The original split-based Accept-Language parsing, kept as the reference behaviour."""
+    import app as app_module
+    for lang_code in header.split(','):
+        lang = lang_code.split(';')[0].strip().split('-')[0].lower()
+        if lang in app_module.SUPPORTED_LANGUAGES:
+            return lang
+    return app_module.DEFAULT_LANGUAGE
+
+@pytest.mark.parametrize("header, expected", [
+    ("fr-CA,fr;q=0.9,en;q=0.8", "fr"),
+    ("xx;q=1.0, de;q=0.7, es;q=0.3", "de"),
+    ("xx-de, ja", "ja"),
+    ("*", "en"),
+    ("*, pt;q=0.5", "pt"),
+    ("en_US, fr", "fr"),
+    ("de_DE, es", "es"),
+    ("ZH-Hant-TW", "zh"),
+    ("english, hindi, hi-IN", "hi"),
+    ("", "en"),
+])
+def test_accept_language_header(header, expected):
+    import app as app_module
+    with app.test_request_context("/", headers={"Accept-Language": header}):
+        assert app_module.get_user_language() == expected == _split_accept_language(header)
+
+def test_lang_query_parameter_overrides_header():
+    import app as app_module
+    with app.test_request_context("/?lang=AR", headers={"Accept-Language": "de"}):
+        assert app_module.get_user_language() == "ar"
+    with app.test_request_context("/?lang=xx", headers={"Accept-Language": "de"}):
+        assert app_module.get_user_language() == "de"
+
+def test_user_language_memoized_per_request(monkeypatch):
+    import app as app_module
+    calls = []
+    detect = app_module._detect_user_language
+    monkeypatch.setattr(app_module, "_detect_user_language", lambda: calls.append(1) or detect())
+    with app.test_request_context("/", headers={"Accept-Language": "ja"}):
+        assert app_module.get_user_language() == "ja"
+        assert app_module.get_user_language() == "ja"
+    with app.test_request_context("/", headers={"Accept-Language": "es"}):
+        assert app_module.get_user_language() == "es"
+    assert len(calls) == 2
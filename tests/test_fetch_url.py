@@ -0,0 +1,157 @@
+import os, sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+# ensure root folder is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import fetch_url
+
+_real_get_cache = fetch_url._get_cache
+
+# path -> (delay in seconds, Content-Type, body); a list body is sent chunk by chunk, sleeping delay before each
+PAGES = {}
+# path -> (Location, Set-Cookie) for 302 responses
+REDIRECTS = {}
+# path -> number of GET requests served
+HITS = {}
+# path -> Cookie header of the last request, if any
+COOKIES = {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        HITS[self.path] = HITS.get(self.path, 0) + 1
+        COOKIES[self.path] = self.headers.get("Cookie")
+        if self.path in REDIRECTS:
+            location, cookie = REDIRECTS[self.path]
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Set-Cookie", cookie)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        delay, content_type, body = PAGES[self.path]
+        chunks = body if isinstance(body, list) else [body]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(sum(map(len, chunks))))
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                time.sleep(delay)
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def no_url_cache(monkeypatch):
+    monkeypatch.setattr(fetch_url, "_get_cache", lambda: None)
+
+
+def test_fetch_paragraph_text(server):
+    PAGES["/article"] = (0, "text/html; charset=utf-8", "<p>Hello</p><div>skip</div><p>world</p>".encode())
+    assert fetch_url.get_text_from_url(server + "/article") == "Hello world"
+
+
+def test_fetch_times_out(server, monkeypatch):
+    PAGES["/slow"] = (2, "text/html", b"<p>late</p>")
+    monkeypatch.setattr(fetch_url, "_TIMEOUT", (1, 0.2))
+    start = time.monotonic()
+    text = fetch_url.get_text_from_url(server + "/slow")
+    assert text.startswith("Error fetching URL")
+    # max_retries=2 allows three attempts, each cut off by the read timeout
+    assert time.monotonic() - start < 2
+
+
+def test_fetch_enforces_overall_deadline(server, monkeypatch):
+    # Every chunk arrives well within the read timeout, but the whole body takes ~3s
+    PAGES["/trickle"] = (0.1, "text/html", [b"<p>drip</p>"] * 30)
+    monkeypatch.setattr(fetch_url, "_TIMEOUT", (1, 1))
+    monkeypatch.setattr(fetch_url, "_DEADLINE", 0.5)
+    monkeypatch.setattr(fetch_url, "_CHUNK_SIZE", 11)
+    start = time.monotonic()
+    text = fetch_url.get_text_from_url(server + "/trickle")
+    assert text.startswith("Error fetching URL")
+    assert time.monotonic() - start < 1.5
+
+
+def test_fetch_never_stores_or_sends_cookies(server):
+    PAGES["/landing"] = (0, "text/html", b"<p>landed</p>")
+    REDIRECTS["/login"] = ("/landing", "sid=abc; Path=/")
+    assert fetch_url.get_text_from_url(server + "/login") == "landed"
+    # Neither the redirect hop nor a later request carries the cookie
+    assert COOKIES["/landing"] is None
+    assert fetch_url.get_text_from_url(server + "/landing") == "landed"
+    assert COOKIES["/landing"] is None
+    assert len(fetch_url._SESSION.cookies) == 0
+
+
+def test_fetch_stops_at_size_cap(server, monkeypatch):
+    PAGES["/huge"] = (0, "text/html", b"<p>word</p>" * 100_000)
+    monkeypatch.setattr(fetch_url, "_MAX_BYTES", 1100)
+    monkeypatch.setattr(fetch_url, "_CHUNK_SIZE", 550)
+    text = fetch_url.get_text_from_url(server + "/huge")
+    assert 0 < text.count("word") <= 100
+
+
+def test_fetch_uses_meta_charset(server):
+    body = '<html><head><meta charset="iso-8859-1"></head><body><p>café naïve</p></body></html>'.encode("latin-1")
+    PAGES["/latin1"] = (0, "text/html", body)
+    assert fetch_url.get_text_from_url(server + "/latin1") == "café naïve"
+
+
+def test_fetch_unknown_header_charset_falls_back_to_utf8(server):
+    PAGES["/utf8mb4"] = (0, "text/html; charset=utf8mb4", "<p>café</p>".encode())
+    assert fetch_url.get_text_from_url(server + "/utf8mb4") == "café"
+
+
+def test_fetch_cache_hit_and_errors_not_cached(server, tmp_path, monkeypatch):
+    pytest.importorskip("diskcache")
+    monkeypatch.setattr(fetch_url, "_get_cache", _real_get_cache)
+    monkeypatch.setattr(fetch_url, "_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(fetch_url, "_cache", None)
+    monkeypatch.setattr(fetch_url, "_cache_pid", None)
+
+    PAGES["/cached"] = (0, "text/html", b"<p>cached</p>")
+    server = server.replace("127.0.0.1", "localhost")
+    assert fetch_url.get_text_from_url(server + "/cached") == "cached"
+    # Same page after URL normalization (host case, fragment) is served from the cache
+    assert fetch_url.get_text_from_url(server.replace("localhost", "LOCALHOST") + "/cached#top") == "cached"
+    assert HITS["/cached"] == 1
+
+    for _ in range(2):
+        assert fetch_url.get_text_from_url(server + "/missing").startswith("Error fetching URL")
+    assert HITS["/missing"] == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX ownership checks")
+def test_cache_dir_must_be_private(tmp_path):
+    private = tmp_path / "cache"
+    fetch_url._ensure_private_dir(str(private))
+    assert private.stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        fetch_url._ensure_private_dir(str(shared))
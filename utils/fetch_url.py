@@ -1,16 +1,201 @@
+import codecs
+import hashlib
+import http.cookiejar
+import os
+import re
+import stat
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    # SQLite-backed on-disk cache shared by all workers on the host
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    # C (Lexbor) HTML5 parser; doesn't build a Python object per node
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+    from bs4 import BeautifulSoup
+
+    try:
+        import lxml  # noqa: F401  (C parser, 2-3x faster than html.parser)
+        _PARSER = "lxml"
+    except ImportError:
+        _PARSER = "html.parser"
+
+# (connect, read) seconds; without it a stalled server hangs the worker forever
+_TIMEOUT = (3, 10)
+# Overall seconds for the whole download; the read timeout alone resets on every chunk, so a server
+# trickling bytes could otherwise hold the worker indefinitely
+_DEADLINE = 20
+# Stop reading pages past this size; articles are far smaller and the models only see the first 10k chars
+_MAX_BYTES = 5 * 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">, looked for near the top
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+_META_SCAN_BYTES = 4096
+
+class _CookielessSession(requests.Session):
+    """
+    Session that never stores or sends cookies. Fetched pages are arbitrary third-party sites,
+    so one user's fetch must not carry cookies set by another's into later requests.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+    def prepare_request(self, request):
+        prepared = super().prepare_request(request)
+        # Redirects collect Set-Cookie headers into the prepared request's own (fresh) jar
+        prepared._cookies.set_policy(self.cookies.get_policy())
+        return prepared
+
+
+# Module-level session: keeps TCP/TLS connections alive across requests to the same host
+_SESSION = _CookielessSession()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=2)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# Per-user by default: cache entries are pickles, so a directory others can write to would let them
+# plant objects that are unpickled here
+_CACHE_DIR = os.environ.get("URL_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), f"qfc_urlcache-{os.getuid()}" if hasattr(os, "getuid") else "qfc_urlcache"
+)
+_CACHE_EXPIRE = 600  # seconds; news pages rarely change within 10 minutes
+_CACHE_SIZE_LIMIT = 2 << 30
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def _ensure_private_dir(path):
+    """
+    Creates path with mode 0700 if missing, and raises PermissionError unless it is a real directory
+    owned by this user that no one else can write to.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise PermissionError(f"{path} must be a directory owned by uid {os.getuid()} and not writable by others")
+
+
+def _get_cache():
+    """
+    Returns this process's diskcache.Cache, or None when diskcache is unavailable.
+    Opened lazily per pid so forked Gunicorn workers never share a SQLite connection.
+    """
+    global _cache, _cache_pid
+    if diskcache is None:
+        return None
+    pid = os.getpid()
+    if _cache_pid != pid:
+        with _cache_lock:
+            if _cache_pid != pid:
+                try:
+                    _ensure_private_dir(_CACHE_DIR)
+                    _cache = diskcache.Cache(_CACHE_DIR, size_limit=_CACHE_SIZE_LIMIT)
+                except Exception as e:
+                    print(f"[fetch_url] URL cache disabled: {e}")
+                    _cache = None
+                _cache_pid = pid
+    return _cache
+
+
+def _cache_key(url):
+    """
+    BLAKE2b digest of the URL with scheme/host lowercased and the #fragment dropped.
+    """
+    parts = urlsplit(url.strip())
+    normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+def _read_capped(response, deadline):
+    """
+    Reads the streamed body in chunks, stopping once _MAX_BYTES have arrived.
+    Raises requests.Timeout once time.monotonic() passes deadline.
+    """
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+        if time.monotonic() > deadline:
+            raise requests.Timeout(f"download took longer than {_DEADLINE}s")
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= _MAX_BYTES:
+            break
+    return b"".join(chunks)
+
+
+def _decode_html(content, encoding):
+    """
+    Decodes HTML bytes using a BOM if present, else the header charset, else a <meta> charset, else UTF-8.
+    Charset names Python doesn't know (e.g. "utf8mb4") fall back to UTF-8 instead of failing the fetch.
+    """
+    for bom, bom_encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if content.startswith(bom):
+            encoding = bom_encoding
+            break
+    else:
+        if not encoding:
+            match = _META_CHARSET_RE.search(content, 0, _META_SCAN_BYTES)
+            encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def _extract_paragraphs(html):
+    """
+    Joins the text of all <p> elements in the HTML document.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        return " ".join(p.text(separator=' ', strip=True) for p in tree.css('p'))
+    soup = BeautifulSoup(html, _PARSER)
+    paragraphs = soup.find_all('p')
+    return " ".join([p.get_text() for p in paragraphs])
+
+
+def _fetch_text(url):
+    deadline = time.monotonic() + _DEADLINE
+    with _SESSION.get(url, timeout=_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        content = _read_capped(response, deadline)
+        # requests guesses ISO-8859-1 for text/* without a charset; sniff <meta> instead
+        declared = "charset" in response.headers.get("Content-Type", "").lower()
+        encoding = response.encoding if declared else None
+    return _extract_paragraphs(_decode_html(content, encoding))
+
 
 def get_text_from_url(url):
     """
     Fetches and returns text content from a given URL.
+    Successful results are cached on disk for _CACHE_EXPIRE seconds; errors are never cached.
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        paragraphs = soup.find_all('p')
-        text = " ".join([p.get_text() for p in paragraphs])
+        cache = _get_cache()
+        key = _cache_key(url) if cache is not None else None
+        if key is not None:
+            text = cache.get(key)
+            if text is not None:
+                return text
+        text = _fetch_text(url)
+        if key is not None:
+            cache.set(key, text, expire=_CACHE_EXPIRE)
         return text
     except Exception as e:
         return f"Error fetching URL: {e}"